@@ -0,0 +1,94 @@
+import json
+import os
+from collections.abc import Iterable
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from http.cookies import Morsel
+from pathlib import Path
+
+from config import config_path, load_config
+
+DEFAULT_REFRESH_MARGIN = 300
+DEFAULT_SESSION_LIFETIME = 24 * 3600
+
+
+def session_path() -> Path:
+    override = os.environ.get("KOLEO_MCP_SESSION")
+    return Path(override) if override else config_path().with_name("session.json")
+
+
+def load_session(margin: int = 0, email: str | None = None) -> dict | None:
+    """Return the stored session if it belongs to `email` and stays valid for at least `margin` more seconds."""
+    p = session_path()
+    try:
+        session = json.loads(p.read_text())
+        valid_until = datetime.fromisoformat(session["valid_until"])
+    except (FileNotFoundError, ValueError, KeyError, TypeError):
+        return None
+    if not isinstance(session.get("auth"), dict):
+        return None
+    if email is not None and session.get("email") != email:
+        return None
+    if valid_until - timedelta(seconds=margin) <= datetime.now(valid_until.tzinfo):
+        return None
+    return session
+
+
+def save_session(auth: dict, valid_until: datetime, email: str | None = None) -> None:
+    """Write the session atomically, readable by the current user only."""
+    p = session_path()
+    p.parent.mkdir(parents=True, exist_ok=True)
+    tmp = p.with_name(p.name + ".tmp")
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w") as f:
+        json.dump({"email": email, "auth": auth, "valid_until": valid_until.isoformat()}, f)
+    os.replace(tmp, p)
+
+
+def clear_session() -> None:
+    session_path().unlink(missing_ok=True)
+
+
+def cookie_expiry(cookies: Iterable[Morsel]) -> datetime | None:
+    """Earliest expiry among cookies that set `max-age` or `expires`, or None if all are session cookies."""
+    now = datetime.now(timezone.utc)
+    expiries = []
+    for morsel in cookies:
+        if morsel["max-age"]:
+            expiries.append(now + timedelta(seconds=int(morsel["max-age"])))
+        elif morsel["expires"]:
+            expiries.append(parsedate_to_datetime(morsel["expires"]))
+    return min(expiries, default=None)
+
+
+async def ensure_authenticated(client) -> None:
+    """Log in only when the stored session is missing, expiring or for another account, then persist it.
+
+    Logging in uses `KoleoAPI.login_password` with the `client_id` from config. When no login is possible
+    (no `client_id`, or the login fails) the client keeps the `auth` cookies from config.json.
+    The expiry comes from the login cookies; when the server sends only session cookies, the configured
+    `session_lifetime` is used instead.
+    """
+    config = load_config()
+    margin = int(config.get("auth_refresh_margin", DEFAULT_REFRESH_MARGIN))
+    session = load_session(margin, config["email"])
+    if session is not None and getattr(client, "_auth", None):
+        return
+    configured = config.get("auth") if isinstance(config.get("auth"), dict) else None
+    if "client_id" not in config:
+        return
+    try:
+        await client.login_password(config["email"], config["password"], config["client_id"])
+    except Exception:
+        if configured:
+            return
+        raise
+    cookies = list(getattr(getattr(client, "_session", None), "cookie_jar", None) or [])
+    auth = {**(getattr(client, "_auth", None) or {}), **{m.key: m.value for m in cookies}}
+    if not auth:
+        return
+    client._auth = auth
+    valid_until = cookie_expiry(cookies) or datetime.now(timezone.utc) + timedelta(
+        seconds=int(config.get("session_lifetime", DEFAULT_SESSION_LIFETIME))
+    )
+    save_session(auth, valid_until, config["email"])
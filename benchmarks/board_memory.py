@@ -0,0 +1,65 @@
+"""Compare the memory held by cached boards as raw JSON dicts vs compact records.
+
+Run with: python benchmarks/board_memory.py
+"""
+
+import json
+import random
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from compact import compact  # noqa: E402
+
+STATIONS = [
+    f"Stacja {name}"
+    for name in (
+        "Kraków Główny", "Warszawa Centralna", "Gdańsk Główny", "Poznań Główny", "Wrocław Główny", "Katowice",
+        "Łódź Fabryczna", "Szczecin Główny", "Lublin Główny", "Rzeszów Główny", "Białystok", "Olsztyn Główny",
+    )
+]
+BRANDS = ["IC", "EIC", "TLK", "REG", "KM", "KD"]
+
+
+def make_board(rng: random.Random, trains: int = 300) -> list[dict]:
+    board = []
+    for i in range(trains):
+        brand = rng.choice(BRANDS)
+        route = rng.sample(range(len(STATIONS)), rng.randint(2, 6))
+        hour, minute = divmod(i * 4, 60)
+        board.append({
+            "train_id": 100000 + i,
+            "train_full_name": f"{brand} {1000 + i}",
+            "brand_id": BRANDS.index(brand) + 1,
+            "departure": f"2026-03-01T{hour % 24:02d}:{minute:02d}:00+01:00",
+            "arrival": f"2026-03-01T{hour % 24:02d}:{minute:02d}:00+01:00",
+            "platform": str(rng.randint(1, 6)),
+            "track": str(rng.randint(1, 12)),
+            "stations": [{"id": s, "name": STATIONS[s], "slug": STATIONS[s].lower().replace(" ", "-")} for s in route],
+        })
+    return board
+
+
+def measure(boards: list[str], transform) -> int:
+    tracemalloc.start()
+    kept = [transform(json.loads(payload)) for payload in boards]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return size
+
+
+def main() -> None:
+    rng = random.Random(0)
+    # Serialized first, so both runs pay for freshly decoded strings like a real HTTP response.
+    boards = [json.dumps(make_board(rng)) for _ in range(50)]
+    raw = measure(boards, lambda board: board)
+    packed = measure(boards, compact)
+    print(f"50 boards x 300 trains: raw dicts {raw / 1e6:.1f} MB, compact {packed / 1e6:.1f} MB "
+          f"({1 - packed / raw:.0%} less)")
+
+
+if __name__ == "__main__":
+    main()
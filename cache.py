@@ -0,0 +1,224 @@
+import argparse
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any
+
+from config import load_config
+
+DEFAULT_CACHE_PATH = Path.home() / ".cache" / "koleo-mcp" / "cache.sqlite3"
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_TOUCH_INTERVAL = 300
+DEFAULT_TTLS = {
+    "train": 7 * 24 * 3600,
+    "station_info": 7 * 24 * 3600,
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (kind, key)
+)
+"""
+
+
+class PersistentCache:
+    """On-disk cache for immutable API payloads, stored as zlib-compressed JSON in SQLite.
+
+    Methods are blocking and thread-safe; async code should go through `cached()`, which runs them in a worker thread.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        ttls: dict[str, int] | None = None,
+        touch_interval: float = DEFAULT_TOUCH_INTERVAL,
+    ):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.touch_interval = touch_interval
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute(_SCHEMA)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at)")
+        self._conn.commit()
+
+    def get(self, kind: str, key: str | int) -> Any | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at, accessed_at FROM entries WHERE kind = ? AND key = ?", (kind, str(key))
+            ).fetchone()
+            if row is None:
+                return None
+            value, created_at, accessed_at = row
+            now = time.time()
+            if now - created_at > self.ttls.get(kind, 0):
+                self._conn.execute("DELETE FROM entries WHERE kind = ? AND key = ?", (kind, str(key)))
+                self._conn.commit()
+                return None
+            # LRU order only needs to be approximate, so skip the write on most hits.
+            if now - accessed_at >= self.touch_interval:
+                self._conn.execute(
+                    "UPDATE entries SET accessed_at = ? WHERE kind = ? AND key = ?", (now, kind, str(key))
+                )
+                self._conn.commit()
+        return json.loads(zlib.decompress(value))
+
+    def set(self, kind: str, key: str | int, value: Any) -> None:
+        blob = zlib.compress(json.dumps(value, ensure_ascii=False).encode())
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (kind, key, value, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (kind, str(key), blob, len(blob), now, now),
+            )
+            self._conn.commit()
+            self._evict()
+
+    def _evict(self) -> int:
+        """Drop least recently used entries until the total blob size fits under max_bytes."""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        removed = 0
+        if total <= self.max_bytes:
+            return removed
+        for kind, key, size in self._conn.execute(
+            "SELECT kind, key, size FROM entries ORDER BY accessed_at ASC"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM entries WHERE kind = ? AND key = ?", (kind, key))
+            total -= size
+            removed += 1
+        self._conn.commit()
+        return removed
+
+    def prune(self) -> int:
+        """Remove expired entries and enforce the size cap. Returns the number of entries removed."""
+        now = time.time()
+        removed = 0
+        with self._lock:
+            for kind in {row[0] for row in self._conn.execute("SELECT DISTINCT kind FROM entries")}:
+                cur = self._conn.execute(
+                    "DELETE FROM entries WHERE kind = ? AND created_at < ?", (kind, now - self.ttls.get(kind, 0))
+                )
+                removed += cur.rowcount
+            self._conn.commit()
+            return removed + self._evict()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._conn.commit()
+            self._conn.execute("VACUUM")
+
+    def stats(self) -> dict:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT kind, COUNT(*), COALESCE(SUM(size), 0) FROM entries GROUP BY kind ORDER BY kind"
+            ).fetchall()
+        return {
+            "path": str(self.path),
+            "max_bytes": self.max_bytes,
+            "total_bytes": sum(r[2] for r in rows),
+            "kinds": {kind: {"entries": count, "bytes": size} for kind, count, size in rows},
+        }
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+_cache: PersistentCache | None = None
+
+
+def get_cache() -> PersistentCache:
+    global _cache
+    if _cache is None:
+        config = load_config()
+        cache_config = config.get("cache") if isinstance(config.get("cache"), dict) else {}
+        path = Path(
+            os.environ.get("KOLEO_MCP_CACHE", cache_config.get("path") or str(DEFAULT_CACHE_PATH))
+        ).expanduser()
+        _cache = PersistentCache(
+            path,
+            max_bytes=int(cache_config.get("max_bytes", DEFAULT_MAX_BYTES)),
+            ttls=cache_config.get("ttl"),
+            touch_interval=float(cache_config.get("touch_interval", DEFAULT_TOUCH_INTERVAL)),
+        )
+    return _cache
+
+
+def reset_cache() -> None:
+    """Close and drop the cache singleton (useful after config changes)."""
+    global _cache
+    if _cache is not None:
+        _cache.close()
+    _cache = None
+
+
+async def cached(kind: str, key: str | int, fetch: Callable[[], Awaitable[Any]]) -> Any:
+    """Return the cached payload for (kind, key), calling fetch() and storing its result on a miss."""
+    cache = get_cache()
+    value = await asyncio.to_thread(cache.get, kind, key)
+    if value is None:
+        value = await fetch()
+        await asyncio.to_thread(cache.set, kind, key, value)
+    return value
+
+
+async def _warm(train_ids: list[int], stations: list[str]) -> int:
+    from koleo.utils import name_to_slug
+
+    from client import close_client, get_client
+
+    try:
+        client = get_client()
+        slugs = [s if ("-" in s and s.islower()) else name_to_slug(s) for s in stations]
+        await asyncio.gather(
+            *(cached("train", tid, lambda tid=tid: client.get_train(tid)) for tid in train_ids),
+            *(cached("station_info", slug, lambda slug=slug: client.get_station_info_by_slug(slug)) for slug in slugs),
+        )
+    finally:
+        await close_client()
+    return len(train_ids) + len(slugs)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="koleo-mcp-cache", description="Inspect and manage the koleo-mcp disk cache.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("stats", help="Show entry counts and sizes per kind")
+    sub.add_parser("prune", help="Remove expired entries and enforce the size cap")
+    sub.add_parser("clear", help="Remove all entries")
+    warm = sub.add_parser("warm", help="Pre-fetch train details and station info into the cache")
+    warm.add_argument("--train-id", type=int, action="append", default=[], help="Koleo train ID (repeatable)")
+    warm.add_argument("--station", action="append", default=[], help="Station name or slug (repeatable)")
+    args = parser.parse_args(argv)
+
+    cache = get_cache()
+    if args.command == "stats":
+        print(json.dumps(cache.stats(), indent=2))
+    elif args.command == "prune":
+        print(f"Removed {cache.prune()} entries")
+    elif args.command == "clear":
+        cache.clear()
+        print("Cache cleared")
+    elif args.command == "warm":
+        print(f"Warmed {asyncio.run(_warm(args.train_id, args.station))} entries")
+
+
+if __name__ == "__main__":
+    main()
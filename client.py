@@ -1,4 +1,7 @@
+import asyncio
 import os
+import ssl
+from contextlib import suppress
 
 import certifi
 
@@ -10,11 +13,57 @@ def _configure_ssl_certificates() -> None:
 
 _configure_ssl_certificates()
 
+import aiohttp
 from koleo.api.client import KoleoAPI
 
+from auth import load_session
 from config import load_config
 
+DEFAULT_HTTP_CONFIG = {
+    "limit": 20,
+    "limit_per_host": 8,
+    "keepalive_timeout": 60,
+    "ttl_dns_cache": 300,
+    "warmup_connections": 2,
+    # KoleoAPI sends almost every call to api.koleo.pl; aiohttp pools connections per host.
+    "warmup_urls": ["https://api.koleo.pl/", "https://koleo.pl/"],
+}
+
 _client: KoleoAPI | None = None
+_session: aiohttp.ClientSession | None = None
+
+
+def _http_config() -> dict:
+    config = load_config()
+    http = config.get("http") if isinstance(config.get("http"), dict) else {}
+    return {**DEFAULT_HTTP_CONFIG, **http}
+
+
+def _get_session(headers: dict | None = None) -> aiohttp.ClientSession:
+    """Return the shared pooled session, creating it inside the running event loop if needed."""
+    global _session
+    if _session is None or _session.closed:
+        http = _http_config()
+        connector = aiohttp.TCPConnector(
+            limit=int(http["limit"]),
+            limit_per_host=int(http["limit_per_host"]),
+            keepalive_timeout=float(http["keepalive_timeout"]),
+            ttl_dns_cache=int(http["ttl_dns_cache"]),
+            ssl=ssl.create_default_context(cafile=os.environ.get("SSL_CERT_FILE") or certifi.where()),
+        )
+        _session = aiohttp.ClientSession(connector=connector, headers=headers)
+    return _session
+
+
+def _attach_session(client: KoleoAPI) -> None:
+    # aiohttp sessions are bound to an event loop, so only share the pool when called from one.
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    # KoleoAPI has no constructor argument for a session, so mirror the default headers it would send.
+    headers = getattr(client, "base_headers", None)
+    client._session = _get_session(dict(headers) if isinstance(headers, dict) else None)
 
 
 def get_client() -> KoleoAPI:
@@ -22,12 +71,47 @@ def get_client() -> KoleoAPI:
     if _client is None:
         _configure_ssl_certificates()
         config = load_config()
-        auth = config.get("auth") if isinstance(config.get("auth"), dict) else None
+        session = load_session(email=config.get("email"))
+        if session is not None:
+            auth = session["auth"]
+        else:
+            auth = config.get("auth") if isinstance(config.get("auth"), dict) else None
         _client = KoleoAPI(auth=auth)
+    _attach_session(_client)
     return _client
 
 
 def reset_client() -> None:
-    """Force re-creation of client (useful after config changes)."""
+    """Force re-creation of client (useful after config changes).
+
+    The pooled connections are kept, but cookies are dropped so a changed login in config takes effect.
+    """
     global _client
     _client = None
+    if _session is not None and not _session.closed:
+        _session.cookie_jar.clear()
+
+
+async def warm_up() -> None:
+    """Open keep-alive connections to Koleo ahead of the first tool call."""
+    get_client()
+    http = _http_config()
+    session = _get_session()
+
+    async def _touch(url: str) -> None:
+        with suppress(aiohttp.ClientError, asyncio.TimeoutError):
+            async with session.head(url, timeout=aiohttp.ClientTimeout(total=5)):
+                pass
+
+    await asyncio.gather(
+        *(_touch(url) for url in http["warmup_urls"] for _ in range(int(http["warmup_connections"])))
+    )
+
+
+async def close_client() -> None:
+    """Drop the client and close the pooled session."""
+    global _session
+    reset_client()
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
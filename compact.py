@@ -0,0 +1,110 @@
+import sys
+import weakref
+from collections.abc import Iterator
+from typing import Any
+
+_shapes: dict[tuple[str, ...], "Shape"] = {}
+_records: "weakref.WeakValueDictionary[tuple, Record]" = weakref.WeakValueDictionary()
+
+
+class Shape:
+    """Key layout shared by every record with the same set of keys, so rows only store their values."""
+
+    __slots__ = ("keys", "index")
+
+    def __init__(self, keys: tuple[str, ...]):
+        self.keys = keys
+        self.index = {k: i for i, k in enumerate(keys)}
+
+
+class Record:
+    """Read-only, dict-like view over a tuple of interned values."""
+
+    __slots__ = ("_shape", "_values", "__weakref__")
+
+    def __init__(self, shape: Shape, values: tuple):
+        self._shape = shape
+        self._values = values
+
+    def __getitem__(self, key: str) -> Any:
+        return self._values[self._shape.index[key]]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._shape.index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._shape.keys)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __repr__(self) -> str:
+        return f"Record({self.to_dict()!r})"
+
+    def get(self, key: str, default: Any = None) -> Any:
+        i = self._shape.index.get(key)
+        return default if i is None else self._values[i]
+
+    def keys(self) -> tuple[str, ...]:
+        return self._shape.keys
+
+    def items(self) -> Iterator[tuple[str, Any]]:
+        return zip(self._shape.keys, self._values)
+
+    def to_dict(self) -> dict:
+        return {k: to_json(v) for k, v in zip(self._shape.keys, self._values)}
+
+
+def _shape(keys: tuple[str, ...]) -> Shape:
+    shape = _shapes.get(keys)
+    if shape is None:
+        shape = _shapes[keys] = Shape(tuple(sys.intern(k) for k in keys))
+    return shape
+
+
+def _types(value: Any) -> Any:
+    if isinstance(value, tuple):
+        return tuple(_types(v) for v in value)
+    return type(value)
+
+
+def _record(d: dict, pooled: bool) -> Record:
+    rec = Record(_shape(tuple(d)), tuple(_compact(v, True) for v in d.values()))
+    if not pooled:
+        return rec
+    try:
+        # Types are part of the key because 1, 1.0 and True compare and hash equal.
+        key = (rec._shape.keys, rec._values, _types(rec._values))
+        return _records.setdefault(key, rec)
+    except TypeError:
+        return rec
+
+
+def _compact(value: Any, nested: bool) -> Any:
+    if isinstance(value, str):
+        return sys.intern(value)
+    if isinstance(value, dict):
+        return _record(value, pooled=nested)
+    if isinstance(value, list):
+        return tuple(_compact(v, nested) for v in value)
+    return value
+
+
+def compact(value: Any) -> Any:
+    """Convert a JSON payload into records, interning strings and sharing identical nested objects.
+
+    Top-level dicts (and dicts directly inside a top-level list) become their own records; anything
+    nested deeper, such as the station list of a board row, is pooled so repeated stations are stored once.
+    """
+    if isinstance(value, list):
+        return tuple(_compact(v, False) for v in value)
+    return _compact(value, False)
+
+
+def to_json(value: Any) -> Any:
+    """Convert records back into plain dicts and lists for a tool response."""
+    if isinstance(value, Record):
+        return value.to_dict()
+    if isinstance(value, (tuple, list)):
+        return [to_json(v) for v in value]
+    return value
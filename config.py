@@ -4,9 +4,25 @@ from pathlib import Path
 
 DEFAULT_CONFIG_PATH = Path.home() / ".config" / "koleo-mcp" / "config.json"
 
+_loaded: dict[Path, tuple[tuple[int, int], dict]] = {}
+
+
+def config_path(path: Path | None = None) -> Path:
+    return path or Path(os.environ.get("KOLEO_MCP_CONFIG", str(DEFAULT_CONFIG_PATH)))
+
 
 def load_config(path: Path | None = None) -> dict:
-    p = path or Path(os.environ.get("KOLEO_MCP_CONFIG", str(DEFAULT_CONFIG_PATH)))
-    if p.exists():
-        return json.loads(p.read_text())
-    return {}
+    """Load the config file, re-parsing it only when its mtime changes. Treat the result as read-only."""
+    p = config_path(path)
+    try:
+        st = p.stat()
+    except FileNotFoundError:
+        _loaded.pop(p, None)
+        return {}
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _loaded.get(p)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    config = json.loads(p.read_text())
+    _loaded[p] = (stamp, config)
+    return config
@@ -1,7 +1,9 @@
 from koleo.api.types import TrainOnStationInfo
 
+from compact import Record
 
-def format_train_on_station(train: TrainOnStationInfo, type: str = "departure") -> str:
+
+def format_train_on_station(train: TrainOnStationInfo | Record, type: str = "departure") -> str:
     time_key = "departure" if type == "departure" else "arrival"
     time_val = train.get(time_key, "")
     time_str = time_val[:16] if time_val else "??:??"
@@ -17,7 +19,12 @@ def format_train_on_station(train: TrainOnStationInfo, type: str = "departure")
     return f"{time_str}  {name}  ({first_station}){pos}"
 
 
-def summarize_board(trains: list[TrainOnStationInfo], station_name: str, date_str: str, type: str) -> str:
+def summarize_board(
+    trains: list[TrainOnStationInfo] | tuple[Record, ...],
+    station_name: str,
+    date_str: str,
+    type: str,
+) -> str:
     label = "Departures" if type == "departure" else "Arrivals"
     lines = [f"{station_name} -- {label} on {date_str}:"]
     lines += [format_train_on_station(t, type) for t in trains[:20]]
@@ -26,3 +33,15 @@ def summarize_board(trains: list[TrainOnStationInfo], station_name: str, date_st
     if not trains:
         lines.append("  No trains found for this time.")
     return "\n".join(lines)
+
+
+def summarize_corridor(trains: list[dict], start_name: str, end_name: str, from_str: str, until_str: str) -> str:
+    lines = [f"Direct trains {start_name} -> {end_name}, departing {from_str}-{until_str}:"]
+    for t in trains:
+        lines.append(
+            f"  {t['departure'][11:16]} -> {t['arrival'][11:16]}  {t['duration_min']}min  {t['train']}"
+            + (f"  pl.{t['departure_platform']}" if t["departure_platform"] else "")
+        )
+    if not trains:
+        lines.append("  No direct trains found in this window.")
+    return "\n".join(lines)
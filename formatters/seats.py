@@ -0,0 +1,23 @@
+def count_seats(seats: list[dict]) -> dict:
+    total = len(seats)
+    free = sum(1 for s in seats if s["state"] == "FREE")
+    reserved = sum(1 for s in seats if s["state"] == "RESERVED")
+    return {"free": free, "reserved": reserved, "blocked": total - free - reserved, "total": total}
+
+
+def format_occupancy_row(row: dict) -> str:
+    dep = (row.get("departure") or "")[:16]
+    head = f"{dep}  {row.get('train', '?')}"
+    if row.get("place_type") is not None:
+        head += f"  type {row['place_type']}"
+    if row.get("error"):
+        return f"{head}: unavailable ({row['error']})"
+    return f"{head}: {row['free']}/{row['total']} free, {row['reserved']} reserved, {row['blocked']} blocked"
+
+
+def summarize_occupancy(rows: list[dict], start_name: str, end_name: str) -> str:
+    lines = [f"Occupancy {start_name} -> {end_name}:"]
+    lines += ["  " + format_occupancy_row(r) for r in rows]
+    if not rows:
+        lines.append("  No connections found.")
+    return "\n".join(lines)
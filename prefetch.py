@@ -0,0 +1,237 @@
+import asyncio
+import time
+from collections import Counter
+from collections.abc import Awaitable, Callable, Hashable
+from contextlib import suppress
+from typing import Any
+
+from config import load_config
+
+DEFAULT_PREFETCH_CONFIG = {
+    "enabled": True,
+    "interval": 30,
+    "budget_per_minute": 20,
+    "top_n": 30,
+    "refresh_ahead": 0.2,
+    "decay": 0.95,
+    "max_failures": 3,
+    "ttl": {
+        "station": 24 * 3600,
+        "departures": 120,
+        "arrivals": 120,
+        "calendar": 3600,
+        "train": 3600,
+        "brands": 24 * 3600,
+        "carriers": 24 * 3600,
+    },
+}
+
+Fetcher = Callable[[Hashable], Awaitable[Any]]
+Warmer = Callable[[Hashable], Awaitable[int]]
+
+
+class AccessLog:
+    """Decaying hit counter of (kind, key) pairs, so the hottest entries drift with recent traffic."""
+
+    def __init__(self, decay: float = 0.95):
+        self.decay_factor = decay
+        self._counts: Counter = Counter()
+
+    def record(self, kind: str, key: Hashable) -> None:
+        self._counts[(kind, key)] += 1
+
+    def decay(self) -> None:
+        for item, count in list(self._counts.items()):
+            count *= self.decay_factor
+            if count < 0.01:
+                del self._counts[item]
+            else:
+                self._counts[item] = count
+
+    def hottest(
+        self, n: int, keep: Callable[[tuple[str, Hashable]], bool] | None = None
+    ) -> list[tuple[str, Hashable]]:
+        ranked = (item for item, _ in self._counts.most_common())
+        return [item for item in ranked if keep is None or keep(item)][:n]
+
+
+class _Entry:
+    __slots__ = ("value", "stored_at", "expires_at", "prefetched")
+
+    def __init__(self, value: Any, ttl: float, prefetched: bool):
+        self.value = value
+        self.stored_at = time.monotonic()
+        self.expires_at = self.stored_at + ttl
+        self.prefetched = prefetched
+
+
+class _Budget:
+    """Token bucket limiting background upstream requests per minute."""
+
+    def __init__(self, per_minute: int):
+        self.capacity = max(0, per_minute)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+
+    def try_take(self) -> bool:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.capacity / 60)
+        self.updated = now
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+
+class Prefetcher:
+    """Short-lived response cache for hot lookups, kept warm by a budgeted background refresher."""
+
+    def __init__(self, config: dict | None = None):
+        config = {**DEFAULT_PREFETCH_CONFIG, **(config or {})}
+        self.config = config
+        self.ttls = {**DEFAULT_PREFETCH_CONFIG["ttl"], **config.get("ttl", {})}
+        self.log = AccessLog(float(config["decay"]))
+        self.budget = _Budget(int(config["budget_per_minute"]))
+        self._fetchers: dict[str, Fetcher] = {}
+        self._stale: dict[str, Callable[[Hashable], bool]] = {}
+        self._warmers: dict[str, Warmer] = {}
+        self._entries: dict[tuple[str, Hashable], _Entry] = {}
+        self._failures: Counter = Counter()
+        self._swept = time.monotonic()
+        self._live = 0
+        self._task: asyncio.Task | None = None
+        self.hits = 0
+        self.misses = 0
+        self.prefetch_hits = 0
+        self.prefetches = 0
+        self.prefetch_errors = 0
+
+    def register(self, kind: str, fetcher: Fetcher, stale: Callable[[Hashable], bool] | None = None) -> None:
+        """Tell the prefetcher how to (re)load entries of `kind` from their key.
+
+        `stale` marks keys that are no longer worth prefetching, such as boards for past dates.
+        """
+        self._fetchers[kind] = fetcher
+        if stale is not None:
+            self._stale[kind] = stale
+
+    def register_warmer(self, kind: str, warmer: Warmer) -> None:
+        """Register a logged-only kind whose hot keys warm other entries through `prefetch()`."""
+        self._warmers[kind] = warmer
+
+    async def fetch(self, kind: str, key: Hashable) -> Any:
+        """Serve a live lookup from the cache, or load it through the registered fetcher."""
+        now = time.monotonic()
+        # Without the background task nothing else evicts entries, so sweep from the request path too.
+        if now - self._swept >= float(self.config["interval"]):
+            self._drop_expired(now)
+        if self.config["enabled"]:
+            self.log.record(kind, key)
+        entry = self._entries.get((kind, key))
+        if entry is not None and entry.expires_at > now:
+            self.hits += 1
+            if entry.prefetched:
+                self.prefetch_hits += 1
+            return entry.value
+        self.misses += 1
+        self._live += 1
+        try:
+            value = await self._fetchers[kind](key)
+        finally:
+            self._live -= 1
+        self._failures.pop((kind, key), None)
+        self._entries[(kind, key)] = _Entry(value, self.ttls.get(kind, 0), prefetched=False)
+        return value
+
+    def _prefetchable(self, item: tuple[str, Hashable]) -> bool:
+        kind, key = item
+        if self._failures[item] >= int(self.config["max_failures"]):
+            return False
+        if kind in self._warmers:
+            return True
+        return kind in self._fetchers and not (kind in self._stale and self._stale[kind](key))
+
+    def _due(self, kind: str, key: Hashable, now: float) -> bool:
+        entry = self._entries.get((kind, key))
+        if entry is None:
+            return True
+        ttl = self.ttls.get(kind, 0)
+        return entry.expires_at - now <= ttl * float(self.config["refresh_ahead"])
+
+    async def prefetch(self, kind: str, key: Hashable) -> bool:
+        """Load one entry in the background if it is due, live traffic is idle and the budget allows it."""
+        if self._live or not self._due(kind, key, time.monotonic()) or not self.budget.try_take():
+            return False
+        try:
+            value = await self._fetchers[kind](key)
+        except Exception:
+            self.prefetch_errors += 1
+            self._failures[(kind, key)] += 1
+            return False
+        self._failures.pop((kind, key), None)
+        self._entries[(kind, key)] = _Entry(value, self.ttls.get(kind, 0), prefetched=True)
+        self.prefetches += 1
+        return True
+
+    async def refresh(self) -> int:
+        """Refresh the hottest entries that are missing or close to expiry. Returns the number refreshed."""
+        refreshed = 0
+        self._drop_expired(time.monotonic())
+        for kind, key in self.log.hottest(int(self.config["top_n"]), self._prefetchable):
+            if self._live:
+                break
+            if kind in self._warmers:
+                refreshed += await self._warmers[kind](key)
+            else:
+                refreshed += await self.prefetch(kind, key)
+        self.log.decay()
+        return refreshed
+
+    def _drop_expired(self, now: float) -> None:
+        self._swept = now
+        for item in [item for item, entry in self._entries.items() if entry.expires_at <= now]:
+            del self._entries[item]
+        for item in [item for item in self._failures if item not in self.log._counts]:
+            del self._failures[item]
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(float(self.config["interval"]))
+            await self.refresh()
+
+    def start(self) -> None:
+        if self.config["enabled"] and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "lookups": lookups,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "prefetch_hits": self.prefetch_hits,
+            "prefetch_hit_rate": round(self.prefetch_hits / lookups, 3) if lookups else 0.0,
+            "prefetches": self.prefetches,
+            "prefetch_errors": self.prefetch_errors,
+            "cached_entries": len(self._entries),
+            "hottest": [{"kind": kind, "key": key} for kind, key in self.log.hottest(10)],
+        }
+
+
+_prefetcher: Prefetcher | None = None
+
+
+def get_prefetcher() -> Prefetcher:
+    global _prefetcher
+    if _prefetcher is None:
+        config = load_config()
+        _prefetcher = Prefetcher(config.get("prefetch") if isinstance(config.get("prefetch"), dict) else None)
+    return _prefetcher
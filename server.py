@@ -1,5 +1,7 @@
 import json
 import os
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 
 import certifi
 
@@ -7,14 +9,35 @@ os.environ.setdefault("SSL_CERT_FILE", certifi.where())
 
 from mcp.server.fastmcp import FastMCP
 
+from client import close_client, warm_up
+from prefetch import get_prefetcher
 from tools.board import get_all_trains, get_arrivals, get_departures
 from tools.connections import search_connections
+from tools.corridor import get_direct_trains
 from tools.realtime import get_realtime_timetable
-from tools.seats import get_brands, get_carriers, get_seat_availability, get_seat_stats
+from tools.seats import (
+    get_brands,
+    get_carriers,
+    get_connections_occupancy,
+    get_seat_availability,
+    get_seat_stats,
+)
 from tools.stations import get_station_info, search_stations
 from tools.trains import get_train_by_id, get_train_calendar, get_train_route
 
-mcp = FastMCP("koleo")
+
+@asynccontextmanager
+async def lifespan(server: FastMCP) -> AsyncIterator[None]:
+    await warm_up()
+    get_prefetcher().start()
+    try:
+        yield
+    finally:
+        await get_prefetcher().stop()
+        await close_client()
+
+
+mcp = FastMCP("koleo", lifespan=lifespan)
 
 
 @mcp.tool(description="Search for train stations by name. Returns station IDs, slugs, and types.")
@@ -80,6 +103,9 @@ async def tool_search_connections(
     direct: bool = False,
     include_prices: bool = False,
     length: int = 5,
+    expand_groups: bool = False,
+    sort_by: str = "arrival",
+    max_stations: int = 4,
 ) -> str:
     """
     Args:
@@ -90,13 +116,35 @@ async def tool_search_connections(
         direct: If True, only return direct trains (no changes)
         include_prices: If True, fetch prices for each connection
         length: Maximum number of connections to return (default 5)
+        expand_groups: If True, search between the rail stations of the origin and destination cities
+            (e.g. Warszawa Centralna, Warszawa Wschodnia, ...) and merge the results
+        sort_by: Ranking for expanded results: 'arrival' (default) or 'duration'
+        max_stations: With expand_groups, how many stations per city to include (default 4, in search order).
+            Raise it for cities with many stations; each extra station adds searches.
     """
     return json.dumps(
-        await search_connections(start, end, date, brands, direct, include_prices, length),
+        await search_connections(
+            start, end, date, brands, direct, include_prices, length, expand_groups, sort_by, max_stations
+        ),
         ensure_ascii=False,
     )
 
 
+@mcp.tool(
+    description="List direct trains between two stations in a time window. "
+    "Faster than connection search for 'which trains go straight from A to B in the next hours'."
+)
+async def tool_get_direct_trains(start: str, end: str, date: str | None = None, hours: int = 2) -> str:
+    """
+    Args:
+        start: Departure station name (e.g. 'Krakow Glowny') or slug
+        end: Arrival station name or slug
+        date: ISO datetime for the start of the window. Defaults to now.
+        hours: Length of the departure window in hours (default 2)
+    """
+    return json.dumps(await get_direct_trains(start, end, date, hours), ensure_ascii=False)
+
+
 @mcp.tool(description="Get the full route and stop schedule for a train by brand and number.")
 async def tool_get_train_route(
     brand: str,
@@ -150,6 +198,35 @@ async def tool_get_seat_stats(
     return json.dumps(await get_seat_stats(brand, train_number, date, stations), ensure_ascii=False)
 
 
+@mcp.tool(
+    description="Compare seat occupancy across the next trains between two stations in one call. "
+    "Returns free/reserved/blocked counts per train and place type."
+)
+async def tool_get_connections_occupancy(
+    start: str,
+    end: str,
+    date: str | None = None,
+    brands: list[str] | None = None,
+    direct: bool = False,
+    length: int = 5,
+    place_types: list[int] | None = None,
+) -> str:
+    """
+    Args:
+        start: Starting station name (e.g. 'Krakow') or slug
+        end: Destination station name or slug
+        date: ISO datetime for departure after. Defaults to now.
+        brands: Optional list of brand codes to filter (e.g. ['IC', 'REG'])
+        direct: If True, only consider direct trains (no changes)
+        length: Number of connections to check (default 5)
+        place_types: Seat/place type IDs to count (default [1], standard seats)
+    """
+    return json.dumps(
+        await get_connections_occupancy(start, end, date, brands, direct, length, place_types),
+        ensure_ascii=False,
+    )
+
+
 @mcp.tool(description="Get raw seat availability for a connection by connection_id, train_nr, and place_type.")
 async def tool_get_seat_availability(connection_id: int, train_nr: int, place_type: int) -> str:
     """
@@ -181,6 +258,22 @@ async def tool_get_realtime_timetable(train_id: int, operating_day: str | None =
     return json.dumps(await get_realtime_timetable(train_id, operating_day), ensure_ascii=False)
 
 
+@mcp.tool(description="Report prefetch cache statistics: hit rates, prefetch counts and the hottest lookups.")
+async def tool_get_prefetch_stats() -> str:
+    stats = get_prefetcher().stats()
+    return json.dumps(
+        {
+            "data": stats,
+            "summary": (
+                f"{stats['lookups']} lookups, hit rate {stats['hit_rate']:.1%}, "
+                f"served by prefetch {stats['prefetch_hit_rate']:.1%} ({stats['prefetches']} prefetches)"
+            ),
+            "koleo_url": "",
+        },
+        ensure_ascii=False,
+    )
+
+
 def main():
     mcp.run()
 
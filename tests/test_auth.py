@@ -0,0 +1,121 @@
+import asyncio
+import json
+import os
+import stat
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from http.cookies import SimpleCookie
+from pathlib import Path
+from unittest import mock
+
+from koleo.api.client import KoleoAPI
+
+import auth
+
+
+def make_client(auth_cookies=None, login_cookies=None, login_error=None):
+    """Autospecced KoleoAPI whose login_password sets `login_cookies` on the session cookie jar."""
+    client = mock.create_autospec(KoleoAPI, instance=True)
+    client._auth = auth_cookies
+    jar = SimpleCookie()
+    client._session = mock.Mock(cookie_jar=[])
+
+    async def login_password(username, password, client_id):
+        if login_error is not None:
+            raise login_error
+        for cookie in login_cookies or ["session=token-1; Max-Age=3600"]:
+            jar.load(cookie)
+        client._session.cookie_jar = list(jar.values())
+
+    client.login_password.side_effect = login_password
+    return client
+
+
+class SessionStoreTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        tmp = Path(self._tmp.name)
+        self.config_path = tmp / "config.json"
+        self.write_config({"email": "a@b.pl", "password": "secret", "client_id": "web"})
+        self._env = {k: os.environ.get(k) for k in ("KOLEO_MCP_CONFIG", "KOLEO_MCP_SESSION")}
+        os.environ["KOLEO_MCP_CONFIG"] = str(tmp / "config.json")
+        os.environ["KOLEO_MCP_SESSION"] = str(tmp / "session.json")
+
+    def write_config(self, config: dict) -> None:
+        self.config_path.write_text(json.dumps(config))
+        stat_result = self.config_path.stat()
+        os.utime(self.config_path, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 1_000_000))
+
+    def tearDown(self):
+        for k, v in self._env.items():
+            if v is None:
+                os.environ.pop(k, None)
+            else:
+                os.environ[k] = v
+        self._tmp.cleanup()
+
+    def test_saved_session_is_private_and_reloadable(self):
+        auth.save_session({"session": "abc"}, datetime.now() + timedelta(hours=1))
+        self.assertEqual(stat.S_IMODE(auth.session_path().stat().st_mode), 0o600)
+        self.assertEqual(auth.load_session()["auth"], {"session": "abc"})
+
+    def test_session_inside_refresh_margin_is_treated_as_expired(self):
+        auth.save_session({"session": "abc"}, datetime.now() + timedelta(seconds=60))
+        self.assertIsNotNone(auth.load_session())
+        self.assertIsNone(auth.load_session(margin=300))
+
+    def test_session_of_another_account_is_rejected(self):
+        auth.save_session({"session": "abc"}, datetime.now() + timedelta(hours=1), "old@b.pl")
+        self.assertIsNone(auth.load_session(email="a@b.pl"))
+        self.assertIsNotNone(auth.load_session(email="old@b.pl"))
+
+    def test_cookie_expiry_uses_earliest_max_age_or_expires(self):
+        cookies = SimpleCookie()
+        cookies.load("a=1; Max-Age=3600")
+        cookies.load("b=2; Expires=Wed, 01 Jan 2031 00:00:00 GMT")
+        cookies.load("c=3")
+        expiry = auth.cookie_expiry(cookies.values())
+        self.assertAlmostEqual((expiry - datetime.now(expiry.tzinfo)).total_seconds(), 3600, delta=5)
+        self.assertIsNone(auth.cookie_expiry([cookies["c"]]))
+
+    def test_ensure_authenticated_reuses_valid_session(self):
+        auth.save_session({"session": "abc"}, datetime.now() + timedelta(hours=1), "a@b.pl")
+        client = make_client({"session": "abc"})
+        asyncio.run(auth.ensure_authenticated(client))
+        client.login_password.assert_not_called()
+
+    def test_ensure_authenticated_logs_in_updates_client_and_persists(self):
+        client = make_client()
+        asyncio.run(auth.ensure_authenticated(client))
+        client.login_password.assert_awaited_once_with("a@b.pl", "secret", "web")
+        self.assertEqual(client._auth, {"session": "token-1"})
+        session = auth.load_session(email="a@b.pl")
+        self.assertEqual(session["auth"], {"session": "token-1"})
+        valid_until = datetime.fromisoformat(session["valid_until"])
+        self.assertAlmostEqual((valid_until - datetime.now(valid_until.tzinfo)).total_seconds(), 3600, delta=5)
+
+    def test_ensure_authenticated_logs_in_again_after_account_change(self):
+        auth.save_session({"session": "abc"}, datetime.now() + timedelta(hours=1), "old@b.pl")
+        client = make_client({"session": "abc"})
+        asyncio.run(auth.ensure_authenticated(client))
+        client.login_password.assert_awaited_once()
+
+    def test_configured_cookies_are_kept_without_client_id(self):
+        self.write_config({"email": "a@b.pl", "password": "secret", "auth": {"session": "configured"}})
+        client = make_client({"session": "configured"})
+        asyncio.run(auth.ensure_authenticated(client))
+        client.login_password.assert_not_called()
+        self.assertEqual(client._auth, {"session": "configured"})
+
+    def test_configured_cookies_are_kept_when_login_fails(self):
+        self.write_config(
+            {"email": "a@b.pl", "password": "secret", "client_id": "web", "auth": {"session": "configured"}}
+        )
+        client = make_client({"session": "configured"}, login_error=RuntimeError("bad credentials"))
+        asyncio.run(auth.ensure_authenticated(client))
+        self.assertEqual(client._auth, {"session": "configured"})
+        self.assertIsNone(auth.load_session())
+
+if __name__ == "__main__":
+    unittest.main()
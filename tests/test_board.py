@@ -0,0 +1,50 @@
+import asyncio
+import json
+import unittest
+from unittest import mock
+
+from tools import board, lookups
+
+
+class FakeClient:
+    async def get_station_by_slug(self, slug):
+        return {"id": 7, "name": "Kraków Główny", "name_slug": slug}
+
+    async def get_departures(self, station_id, dt):
+        return [
+            {"train_id": 1, "train_full_name": "IC 1", "departure": "2026-03-01T06:00:00", "stations": []},
+            {
+                "train_id": 2,
+                "train_full_name": "IC 2",
+                "departure": "2026-03-01T08:00:00",
+                "stations": [{"id": 1, "name": "Kraków Główny"}],
+            },
+        ]
+
+    async def get_arrivals(self, station_id, dt):
+        return [{"train_id": 3, "train_full_name": "IC 3", "arrival": "2026-03-01T09:00:00", "stations": []}]
+
+
+class BoardToolTests(unittest.TestCase):
+    def setUp(self):
+        lookups._prefetcher._entries.clear()
+        patcher = mock.patch.object(lookups, "get_client", return_value=FakeClient())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(lookups._prefetcher._entries.clear)
+
+    def test_board_tools_return_json_serializable_output(self):
+        for tool in (board.get_departures, board.get_arrivals, board.get_all_trains):
+            with self.subTest(tool=tool.__name__):
+                result = asyncio.run(tool("krakow-glowny", "2026-03-01T07:00"))
+                self.assertNotIn("error", result)
+                json.dumps(result, ensure_ascii=False)
+
+    def test_departures_are_filtered_and_converted_to_dicts(self):
+        result = asyncio.run(board.get_departures("krakow-glowny", "2026-03-01T07:00"))
+        self.assertEqual([t["train_id"] for t in result["data"]], [2])
+        self.assertEqual(result["data"][0]["stations"], [{"id": 1, "name": "Kraków Główny"}])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import asyncio
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+import cache
+
+
+class PersistentCacheTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmp.name) / "cache.sqlite3"
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_round_trip_survives_reopen(self):
+        store = cache.PersistentCache(self.path)
+        store.set("train", 42, {"train": {"id": 42}, "stops": [{"station_name": "Kraków Główny"}]})
+        store.close()
+
+        store = cache.PersistentCache(self.path)
+        self.assertEqual(store.get("train", 42)["stops"][0]["station_name"], "Kraków Główny")
+        store.close()
+
+    def test_expired_entries_are_misses(self):
+        store = cache.PersistentCache(self.path, ttls={"train": 0})
+        store.set("train", 1, {"id": 1})
+        time.sleep(0.01)
+        self.assertIsNone(store.get("train", 1))
+        store.close()
+
+    def test_size_cap_evicts_least_recently_used(self):
+        store = cache.PersistentCache(self.path, touch_interval=0)
+        store.set("train", 1, {"blob": "a" * 10})
+        store.set("train", 2, {"blob": "b" * 10})
+        store.get("train", 1)
+        store.max_bytes = store.stats()["total_bytes"] - 1
+        store.prune()
+        self.assertIsNotNone(store.get("train", 1))
+        self.assertIsNone(store.get("train", 2))
+        store.close()
+
+    def test_recent_hits_do_not_rewrite_access_time(self):
+        store = cache.PersistentCache(self.path, touch_interval=300)
+        store.set("train", 1, {"id": 1})
+        before = store._conn.execute("SELECT accessed_at FROM entries").fetchone()[0]
+        time.sleep(0.01)
+        store.get("train", 1)
+        self.assertEqual(store._conn.execute("SELECT accessed_at FROM entries").fetchone()[0], before)
+        store.close()
+
+    def test_cached_only_fetches_on_miss(self):
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            return {"id": 7}
+
+        cache.reset_cache()
+        cache._cache = cache.PersistentCache(self.path)
+        try:
+            first = asyncio.run(cache.cached("station_info", "krakow-glowny", fetch))
+            second = asyncio.run(cache.cached("station_info", "krakow-glowny", fetch))
+        finally:
+            cache.reset_cache()
+        self.assertEqual(first, second)
+        self.assertEqual(len(calls), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+import importlib
+import unittest
+
+
+class ClientPoolTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.client = importlib.import_module("client")
+        await self.client.close_client()
+
+    async def asyncTearDown(self):
+        await self.client.close_client()
+
+    async def test_reset_client_keeps_pooled_session(self):
+        first = self.client.get_client()
+        session = first._session
+
+        self.client.reset_client()
+        second = self.client.get_client()
+
+        self.assertIsNot(first, second)
+        self.assertIs(second._session, session)
+        self.assertFalse(session.closed)
+
+    async def test_reset_client_clears_cookies(self):
+        session = self.client.get_client()._session
+        session.cookie_jar.update_cookies({"sessionid": "old-login"})
+
+        self.client.reset_client()
+
+        self.assertEqual(len(session.cookie_jar), 0)
+
+    async def test_close_client_closes_pooled_session(self):
+        session = self.client.get_client()._session
+
+        await self.client.close_client()
+
+        self.assertTrue(session.closed)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import json
+import unittest
+
+from compact import Record, compact, to_json
+
+
+def board_row(train_id: int) -> dict:
+    return {
+        "train_id": train_id,
+        "train_full_name": f"IC {train_id}",
+        "departure": "2026-03-01T08:00:00",
+        "stations": [{"id": 1, "name": "Kraków Główny"}, {"id": 2, "name": "Warszawa Centralna"}],
+    }
+
+
+class CompactTests(unittest.TestCase):
+    def test_round_trip_matches_original_payload(self):
+        payload = json.loads(json.dumps([board_row(1), board_row(2)]))
+        self.assertEqual(to_json(compact(payload)), payload)
+
+    def test_records_behave_like_read_only_dicts(self):
+        row = compact([board_row(1)])[0]
+        self.assertIsInstance(row, Record)
+        self.assertEqual(row["train_full_name"], "IC 1")
+        self.assertEqual(row.get("platform", ""), "")
+        self.assertEqual(row["stations"][0]["name"], "Kraków Główny")
+        self.assertEqual(dict(row)["train_id"], 1)
+
+    def test_nested_values_that_compare_equal_across_types_are_not_merged(self):
+        payload = {"x": [{"a": 1}, {"a": True}, {"a": 1.0}, {"a": [1]}, {"a": [True]}]}
+        self.assertEqual(to_json(compact(payload)), payload)
+        self.assertEqual([type(v["a"]) for v in to_json(compact(payload))["x"][:3]], [int, bool, float])
+        self.assertIs(to_json(compact(payload))["x"][4]["a"][0], True)
+
+    def test_to_json_converts_lists_of_records(self):
+        rows = [row for row in compact([board_row(1), board_row(2)]) if row["train_id"] > 1]
+        self.assertEqual(json.loads(json.dumps(to_json(rows))), [board_row(2)])
+
+    def test_repeated_nested_stations_and_shapes_are_shared(self):
+        first, second = compact(json.loads(json.dumps([board_row(1), board_row(2)])))
+        self.assertIs(first["stations"][0], second["stations"][0])
+        self.assertIs(first._shape, second._shape)
+        self.assertIs(first["departure"], second["departure"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,36 @@
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+import config
+
+
+class LoadConfigTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmp.name) / "config.json"
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_missing_file_returns_empty_dict(self):
+        self.assertEqual(config.load_config(self.path), {})
+
+    def test_unchanged_file_is_not_reparsed(self):
+        self.path.write_text(json.dumps({"email": "a@b.pl"}))
+        first = config.load_config(self.path)
+        self.assertIs(config.load_config(self.path), first)
+
+    def test_reloads_when_mtime_changes(self):
+        self.path.write_text(json.dumps({"email": "a@b.pl"}))
+        config.load_config(self.path)
+        self.path.write_text(json.dumps({"email": "c@d.pl"}))
+        stat = self.path.stat()
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        self.assertEqual(config.load_config(self.path)["email"], "c@d.pl")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from tools import connections, lookups
+from tools.connections import group_members, merge_connections, search_connections
+
+
+def conn(train_nr: int, departure: str, arrival: str, duration: int) -> dict:
+    return {
+        "uuid": f"{train_nr}-{departure}",
+        "departure": departure,
+        "arrival": arrival,
+        "duration": duration,
+        "legs": [{"leg_type": "train_leg", "train_nr": train_nr}],
+    }
+
+
+class StationGroupTests(unittest.TestCase):
+    def test_group_members_keeps_rail_stations_of_the_city(self):
+        found = [
+            {"id": 1, "name": "Warszawa", "name_slug": "warszawa", "type": "group"},
+            {"id": 2, "name": "Warszawa Centralna", "name_slug": "warszawa-centralna", "type": "rail"},
+            {"id": 3, "name": "Warszawa Wschodnia", "name_slug": "warszawa-wschodnia", "type": "rail"},
+            {"id": 4, "name": "Warszawa Dw. Zachodni", "name_slug": "warszawa-dw-zachodni", "type": "bus"},
+            {"id": 5, "name": "Warszawice", "name_slug": "warszawice", "type": "rail"},
+        ]
+        self.assertEqual([s["id"] for s in group_members(found, "Warszawa", 4)], [2, 3])
+        self.assertEqual([s["id"] for s in group_members(found, "Warszawa Centralna", 4)], [2])
+
+    def test_merge_deduplicates_trains_and_ranks(self):
+        batches = [
+            [
+                conn(1, "2026-03-01T08:00", "2026-03-01T10:30", 150),
+                conn(2, "2026-03-01T08:30", "2026-03-01T10:45", 135),
+            ],
+            [
+                conn(1, "2026-03-01T08:10", "2026-03-01T10:30", 140),
+                conn(3, "2026-03-01T09:00", "2026-03-01T10:40", 100),
+            ],
+        ]
+
+        by_arrival = merge_connections(batches, "arrival", 5)
+        by_duration = merge_connections(batches, "duration", 2)
+
+        self.assertEqual(
+            [c["uuid"] for c in by_arrival],
+            ["1-2026-03-01T08:10", "3-2026-03-01T09:00", "2-2026-03-01T08:30"],
+        )
+        self.assertEqual([c["uuid"] for c in by_duration], ["3-2026-03-01T09:00", "2-2026-03-01T08:30"])
+
+    def test_merge_keeps_same_train_on_different_days_apart(self):
+        batches = [
+            [
+                conn(1, "2026-03-01T08:00", "2026-03-01T10:30", 150),
+                conn(1, "2026-03-02T08:00", "2026-03-02T10:30", 150),
+            ]
+        ]
+        self.assertEqual(len(merge_connections(batches, "arrival", 5)), 2)
+
+    def test_merge_rejects_unknown_sort_key(self):
+        with self.assertRaises(ValueError):
+            merge_connections([], "price", 5)
+
+
+class FakeClient:
+    def __init__(self):
+        self.searches = []
+
+    async def find_station(self, query):
+        base = 10 if query == "Krakow" else 20
+        return [
+            {"id": base + i, "name": f"{query} {i}", "name_slug": f"{query.lower()}-{i}", "type": "rail"}
+            for i in range(3)
+        ]
+
+    async def get_brands(self):
+        return [{"id": 1, "name": "IC", "logo_text": "IC"}]
+
+    async def v3_connection_search(self, start_id, end_id, brand_ids, fetch_date, direct):
+        self.searches.append((start_id, end_id))
+        if self.searches.count((start_id, end_id)) > 2:
+            return []
+        page = self.searches.count((start_id, end_id))
+        nr = start_id * 100 + end_id * 10 + page
+        dep = f"2026-03-01T{7 + page:02d}:00:00"
+        return [conn(nr, dep, f"2026-03-01T{10 + page:02d}:{start_id % 60:02d}:00", 180 + start_id)]
+
+
+class GroupSearchTests(unittest.TestCase):
+    def setUp(self):
+        lookups._prefetcher._entries.clear()
+        self.client = FakeClient()
+        for module in (connections, lookups):
+            patcher = mock.patch.object(module, "get_client", return_value=self.client)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(lookups._prefetcher._entries.clear)
+
+    def test_group_search_pages_every_pair_within_station_cap(self):
+        result = asyncio.run(
+            search_connections("Krakow", "Warszawa", "2026-03-01T07:00", length=2, expand_groups=True, max_stations=2)
+        )
+
+        self.assertNotIn("error", result)
+        self.assertEqual(sorted(set(self.client.searches)), [(10, 20), (10, 21), (11, 20), (11, 21)])
+        self.assertTrue(all(self.client.searches.count(pair) == 2 for pair in set(self.client.searches)))
+        self.assertEqual(len(result["data"]), 2)
+
+    def test_unknown_sort_by_is_rejected(self):
+        result = asyncio.run(search_connections("Krakow", "Warszawa", expand_groups=True, sort_by="price"))
+
+        self.assertEqual(result["error"], "invalid_params")
+        self.assertEqual(self.client.searches, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from compact import compact
+from tools import lookups
+from tools.corridor import get_direct_trains, join_boards
+
+
+def row(name: str, run_id: int | None, time_key: str, time: str, **extra) -> dict:
+    """Board row shaped like koleo's TrainOnStationInfo: the run id lives in the stations list."""
+    stations = [{"id": 1, "name": "Kraków Główny"}] if run_id is None else [{"id": 1, "train_id": run_id}]
+    return {"train_full_name": name, time_key: time, "stations": stations, **extra}
+
+
+class FakeClient:
+    async def get_station_by_slug(self, slug):
+        return {"id": {"krakow-glowny": 1, "gdynia-glowna": 2}[slug], "name": slug, "name_slug": slug}
+
+    async def get_departures(self, station_id, dt):
+        day = dt.date().isoformat()
+        return [row("TLK 9", 900 + dt.day, "departure", f"{day}T22:30:00")]
+
+    async def get_arrivals(self, station_id, dt):
+        day = dt.date().isoformat()
+        return [row("TLK 9", 900 + dt.day - 1, "arrival", f"{day}T06:10:00")]
+
+
+class JoinBoardsTests(unittest.TestCase):
+    def test_keeps_trains_that_reach_destination_after_leaving(self):
+        departures = compact([
+            row("IC 1", 1, "departure", "2026-03-01T08:00:00", platform="2"),
+            row("REG 2", 2, "departure", "2026-03-01T08:30:00"),
+            row("IC 3", 3, "departure", "2026-03-01T09:00:00"),
+            row("IC 4", 4, "departure", "2026-03-01T12:00:00"),
+        ])
+        arrivals = compact([
+            row("IC 1", 1, "arrival", "2026-03-01T10:15:00"),
+            row("IC 3", 3, "arrival", "2026-03-01T07:00:00"),
+            row("IC 4", 4, "arrival", "2026-03-01T14:00:00"),
+        ])
+
+        trains = join_boards(departures, arrivals, "2026-03-01T07:30", "2026-03-01T09:30")
+
+        self.assertEqual([t["train"] for t in trains], ["IC 1"])
+        self.assertEqual(trains[0]["train_id"], 1)
+        self.assertEqual(trains[0]["duration_min"], 135)
+        self.assertEqual(trains[0]["departure_platform"], "2")
+
+    def test_same_train_name_on_several_days_joins_its_own_run(self):
+        departures = compact([row("IC 1234", 501, "departure", "2026-03-01T08:00:00")])
+        arrivals = compact([
+            row("IC 1234", 501, "arrival", "2026-03-01T10:30:00"),
+            row("IC 1234", 502, "arrival", "2026-03-02T10:30:00"),
+        ])
+
+        trains = join_boards(departures, arrivals, "2026-03-01T07:00", "2026-03-01T09:00")
+
+        self.assertEqual([(t["arrival"], t["duration_min"]) for t in trains], [("2026-03-01T10:30:00", 150)])
+
+    def test_name_only_rows_use_earliest_arrival_after_departure(self):
+        departures = compact([row("IC 1234", None, "departure", "2026-03-01T08:00:00")])
+        arrivals = compact([
+            row("IC 1234", None, "arrival", "2026-03-02T10:30:00"),
+            row("IC 1234", None, "arrival", "2026-03-01T10:30:00"),
+            row("IC 1234", None, "arrival", "2026-03-01T07:30:00"),
+        ])
+
+        trains = join_boards(departures, arrivals, "2026-03-01T07:00", "2026-03-01T09:00")
+
+        self.assertEqual([t["arrival"] for t in trains], ["2026-03-01T10:30:00"])
+
+
+class DirectTrainsToolTests(unittest.TestCase):
+    def setUp(self):
+        lookups._prefetcher._entries.clear()
+        patcher = mock.patch.object(lookups, "get_client", return_value=FakeClient())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(lookups._prefetcher._entries.clear)
+
+    def test_overnight_train_arriving_after_midnight_is_kept(self):
+        result = asyncio.run(get_direct_trains("krakow-glowny", "gdynia-glowna", "2026-03-01T21:00", hours=2))
+
+        self.assertNotIn("error", result)
+        self.assertEqual([t["train"] for t in result["data"]], ["TLK 9"])
+        self.assertEqual(result["data"][0]["arrival"], "2026-03-02T06:10:00")
+        self.assertEqual(result["data"][0]["duration_min"], 460)
+
+    def test_non_positive_hours_are_rejected(self):
+        result = asyncio.run(get_direct_trains("krakow-glowny", "gdynia-glowna", "2026-03-01T01:00", hours=-2))
+
+        self.assertEqual(result["error"], "invalid_params")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import asyncio
+import unittest
+
+from prefetch import AccessLog, Prefetcher
+
+
+class AccessLogTests(unittest.TestCase):
+    def test_hottest_ranks_by_count_and_filters_kinds(self):
+        log = AccessLog()
+        for _ in range(3):
+            log.record("departures", (1, "2026-03-01"))
+        log.record("station", "krakow-glowny")
+        log.record("route", ("krakow-glowny", "warszawa-centralna"))
+        self.assertEqual(log.hottest(1), [("departures", (1, "2026-03-01"))])
+        self.assertEqual(log.hottest(5, lambda item: item[0] == "station"), [("station", "krakow-glowny")])
+
+
+class PrefetcherTests(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+
+        async def fetch(key):
+            self.calls.append(key)
+            return {"key": key, "call": len(self.calls)}
+
+        self.fetch = fetch
+
+    def make(self, **config):
+        prefetcher = Prefetcher({"ttl": {"station": 60}, **config})
+        prefetcher.register("station", self.fetch)
+        return prefetcher
+
+    def test_live_fetch_is_cached_within_ttl(self):
+        prefetcher = self.make()
+        asyncio.run(prefetcher.fetch("station", "krakow-glowny"))
+        asyncio.run(prefetcher.fetch("station", "krakow-glowny"))
+        self.assertEqual(self.calls, ["krakow-glowny"])
+        self.assertEqual(prefetcher.stats()["hit_rate"], 0.5)
+
+    def test_refresh_reloads_entries_close_to_expiry_and_counts_prefetch_hits(self):
+        prefetcher = self.make(refresh_ahead=1.0)
+        asyncio.run(prefetcher.fetch("station", "krakow-glowny"))
+        self.assertEqual(asyncio.run(prefetcher.refresh()), 1)
+        value = asyncio.run(prefetcher.fetch("station", "krakow-glowny"))
+        self.assertEqual(value["call"], 2)
+        self.assertEqual(prefetcher.stats()["prefetch_hits"], 1)
+
+    def test_refresh_respects_budget(self):
+        prefetcher = self.make(budget_per_minute=1, refresh_ahead=1.0)
+        asyncio.run(prefetcher.fetch("station", "a"))
+        asyncio.run(prefetcher.fetch("station", "b"))
+        self.assertEqual(asyncio.run(prefetcher.refresh()), 1)
+        self.assertEqual(asyncio.run(prefetcher.refresh()), 0)
+
+    def test_stale_keys_are_skipped(self):
+        prefetcher = self.make(refresh_ahead=1.0)
+        prefetcher.register("departures", self.fetch, stale=lambda key: key[1] < "2026-03-01")
+        asyncio.run(prefetcher.fetch("departures", (1, "2026-02-28")))
+        asyncio.run(prefetcher.fetch("departures", (1, "2026-03-01")))
+        self.calls.clear()
+        asyncio.run(prefetcher.refresh())
+        self.assertEqual(self.calls, [(1, "2026-03-01")])
+
+    def test_route_warmer_prefetches_through_budget(self):
+        prefetcher = self.make(budget_per_minute=1)
+
+        async def warm(key):
+            return sum([await prefetcher.prefetch("station", key[0]), await prefetcher.prefetch("station", key[1])])
+
+        prefetcher.register_warmer("route", warm)
+        prefetcher.log.record("route", ("a", "b"))
+        self.assertEqual(asyncio.run(prefetcher.refresh()), 1)
+        self.assertEqual(self.calls, ["a"])
+
+    def test_keys_that_keep_failing_stop_using_budget(self):
+        async def broken(key):
+            self.calls.append(key)
+            raise RuntimeError("unknown slug")
+
+        prefetcher = Prefetcher({"max_failures": 2, "budget_per_minute": 100})
+        prefetcher.register("station", broken)
+        prefetcher.log.record("station", "nowhere")
+        for _ in range(4):
+            asyncio.run(prefetcher.refresh())
+        self.assertEqual(self.calls, ["nowhere", "nowhere"])
+
+    def test_disabled_prefetcher_does_not_log_and_evicts_on_fetch(self):
+        prefetcher = self.make(enabled=False, interval=0, ttl={"station": 0})
+        asyncio.run(prefetcher.fetch("station", "a"))
+        asyncio.run(prefetcher.fetch("station", "b"))
+        self.assertEqual(prefetcher.log.hottest(10), [])
+        self.assertEqual(list(prefetcher._entries), [("station", "b")])
+
+    def test_fresh_entries_are_not_refreshed(self):
+        prefetcher = self.make(refresh_ahead=0.1)
+        asyncio.run(prefetcher.fetch("station", "a"))
+        self.assertEqual(asyncio.run(prefetcher.refresh()), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
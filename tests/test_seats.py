@@ -0,0 +1,84 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from tools import seats
+
+
+def connection(uuid: str, legs: list[tuple[int, str]]) -> dict:
+    return {
+        "uuid": uuid,
+        "departure": legs[0][1],
+        "legs": [
+            {"leg_type": "train_leg", "train_nr": nr, "train_full_name": f"IC {nr}", "departure": dep}
+            for nr, dep in legs
+        ],
+    }
+
+
+class FakeClient:
+    def __init__(self, failing_uuids: set[str] = frozenset()):
+        self.failing_uuids = failing_uuids
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def _track(self):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.001)
+        self.in_flight -= 1
+
+    async def v3_get_connection_id(self, uuid):
+        await self._track()
+        if uuid in self.failing_uuids:
+            raise RuntimeError("upstream error")
+        return int(uuid)
+
+    async def get_connection(self, connection_id):
+        await self._track()
+        nrs = {1: [101], 2: [201, 202], 3: [301]}[connection_id]
+        return {"trains": [{"train_nr": nr, "train_full_name": f"IC {nr}"} for nr in nrs]}
+
+    async def get_seats_availability(self, connection_id, train_nr, place_type):
+        await self._track()
+        return {"seats": [{"state": "FREE"}, {"state": "RESERVED"}]}
+
+
+class ConnectionsOccupancyTests(unittest.TestCase):
+    connections = [
+        connection("1", [(101, "2026-03-01T08:00:00")]),
+        connection("2", [(201, "2026-03-01T09:00:00"), (202, "2026-03-01T10:30:00")]),
+        connection("3", [(301, "2026-03-01T11:00:00")]),
+    ]
+
+    def run_tool(self, client: FakeClient) -> dict:
+        stations = ({"name": "Kraków Główny"}, {"name": "Warszawa Centralna"}, self.connections)
+        with (
+            mock.patch.object(seats, "get_client", return_value=client),
+            mock.patch.object(seats, "find_connections", mock.AsyncMock(return_value=stations)),
+        ):
+            return asyncio.run(
+                seats.get_connections_occupancy("Krakow", "Warszawa", "2026-03-01T07:00", concurrency=2)
+            )
+
+    def test_one_row_per_leg_with_the_legs_own_departure(self):
+        client = FakeClient()
+        result = self.run_tool(client)
+
+        rows = result["data"]
+        self.assertEqual([r["train_nr"] for r in rows], [101, 201, 202, 301])
+        self.assertEqual(rows[2]["departure"], "2026-03-01T10:30:00")
+        self.assertEqual((rows[0]["free"], rows[0]["reserved"], rows[0]["total"]), (1, 1, 2))
+        self.assertLessEqual(client.max_in_flight, 2)
+
+    def test_failed_connection_becomes_an_error_row(self):
+        result = self.run_tool(FakeClient(failing_uuids={"2"}))
+
+        rows = result["data"]
+        self.assertNotIn("error", result)
+        self.assertEqual([r.get("error") for r in rows], [None, "RuntimeError", None])
+        self.assertEqual(rows[1]["train"], "IC 201, IC 202")
+
+
+if __name__ == "__main__":
+    unittest.main()
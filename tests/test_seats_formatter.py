@@ -0,0 +1,23 @@
+import unittest
+
+from formatters.seats import count_seats, summarize_occupancy
+
+
+class OccupancyFormatterTests(unittest.TestCase):
+    def test_count_seats_splits_states(self):
+        seats = [{"state": "FREE"}, {"state": "FREE"}, {"state": "RESERVED"}, {"state": "BLOCKED"}]
+        self.assertEqual(count_seats(seats), {"free": 2, "reserved": 1, "blocked": 1, "total": 4})
+
+    def test_summary_lists_counts_and_errors(self):
+        rows = [
+            {"departure": "2026-03-01T08:00:00", "train": "IC 1106", "place_type": 1,
+             "free": 10, "reserved": 5, "blocked": 1, "total": 16},
+            {"departure": "2026-03-01T09:00:00", "train": "IC 3100", "place_type": 1, "error": "KoleoNotFound"},
+        ]
+        summary = summarize_occupancy(rows, "Kraków Główny", "Warszawa Centralna")
+        self.assertIn("2026-03-01T08:00  IC 1106  type 1: 10/16 free, 5 reserved, 1 blocked", summary)
+        self.assertIn("IC 3100  type 1: unavailable (KoleoNotFound)", summary)
+
+
+if __name__ == "__main__":
+    unittest.main()
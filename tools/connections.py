@@ -1,11 +1,123 @@
-from asyncio import gather
+from asyncio import Semaphore, gather
 from datetime import datetime, timedelta
 
+from koleo.api.types import V3ConnectionResult
 from koleo.utils import koleo_time_to_dt, name_to_slug
 
 from client import get_client
 from errors import handle_tool_error
 from formatters.connections import summarize_connections
+from tools import lookups
+
+SORT_KEYS = ("arrival", "duration")
+
+
+def _slug(station: str) -> str:
+    return station if ("-" in station and station.islower()) else name_to_slug(station)
+
+
+def _brand_ids(api_brands: list[dict], brands: list[str] | None) -> list[int]:
+    if not brands:
+        return [b["id"] for b in api_brands]
+    brands_lower = [b.lower() for b in brands]
+    return [b["id"] for b in api_brands if b["name"].lower() in brands_lower or b["logo_text"].lower() in brands_lower]
+
+
+async def _page_connections(
+    start_id: int, end_id: int, brand_ids: list[int], dt: datetime, direct: bool, length: int
+) -> list[V3ConnectionResult]:
+    client = get_client()
+    results = []
+    fetch_date = dt
+    while len(results) < length:
+        connections = await client.v3_connection_search(start_id, end_id, brand_ids, fetch_date, direct)
+        if not connections:
+            break
+        results.extend(connections)
+        fetch_date = koleo_time_to_dt(connections[-1]["departure"]) + timedelta(seconds=1801)
+    return results[:length]
+
+
+async def find_connections(
+    start: str,
+    end: str,
+    dt: datetime,
+    brands: list[str] | None = None,
+    direct: bool = False,
+    length: int = 5,
+) -> tuple[dict, dict, list[V3ConnectionResult]]:
+    """Resolve both stations and page through v3 connection search until `length` results are collected."""
+    lookups.record_route(_slug(start), _slug(end))
+    start_station, end_station, api_brands = await gather(
+        lookups.station_by_slug(_slug(start)),
+        lookups.station_by_slug(_slug(end)),
+        lookups.brands(),
+    )
+    brand_ids = _brand_ids(api_brands, brands)
+    results = await _page_connections(start_station["id"], end_station["id"], brand_ids, dt, direct, length)
+    return start_station, end_station, results
+
+
+def group_members(stations: list[dict], query: str, limit: int) -> list[dict]:
+    """Pick the rail stations whose name starts with the queried city name, e.g. all 'Warszawa ...' stations."""
+    prefix = _slug(query)
+    rail = [s for s in stations if s.get("type", "").lower() not in ("group", "bus")]
+    members = [s for s in rail if s.get("name_slug", "") == prefix or s.get("name_slug", "").startswith(prefix + "-")]
+    return (members or rail or stations)[:limit]
+
+
+def merge_connections(batches: list[list[V3ConnectionResult]], sort_by: str, length: int) -> list[V3ConnectionResult]:
+    """Merge per-station-pair results, keeping the shortest option for each run of trains, then rank them.
+
+    A run is the sequence of train numbers on one departure date, so the same trains on different days stay apart.
+    """
+    if sort_by not in SORT_KEYS:
+        raise ValueError(f"sort_by must be one of {', '.join(SORT_KEYS)}")
+    best: dict[tuple, V3ConnectionResult] = {}
+    for conn in (c for batch in batches for c in batch):
+        trains = tuple(leg.get("train_nr") for leg in conn.get("legs", []) if leg.get("leg_type") == "train_leg")
+        key = ((conn.get("departure") or "")[:10], trains) if trains else (conn.get("departure"), conn.get("arrival"))
+        if key not in best or conn.get("duration", 0) < best[key].get("duration", 0):
+            best[key] = conn
+    if sort_by == "duration":
+        rank = lambda c: (c.get("duration", 0), c.get("arrival") or "")  # noqa: E731
+    else:
+        rank = lambda c: (c.get("arrival") or "", c.get("duration", 0))  # noqa: E731
+    return sorted(best.values(), key=rank)[:length]
+
+
+async def find_group_connections(
+    start: str,
+    end: str,
+    dt: datetime,
+    brands: list[str] | None = None,
+    direct: bool = False,
+    length: int = 5,
+    sort_by: str = "arrival",
+    max_stations: int = 4,
+) -> tuple[list[dict], list[dict], list[V3ConnectionResult]]:
+    """Search every station pair of the origin and destination groups concurrently and merge the results.
+
+    Each side is capped at `max_stations` stations, taken in `find_station` order.
+    """
+    client = get_client()
+    lookups.record_route(_slug(start), _slug(end))
+    start_found, end_found, api_brands = await gather(
+        client.find_station(start),
+        client.find_station(end),
+        lookups.brands(),
+    )
+    starts = group_members(start_found, start, max_stations)
+    ends = group_members(end_found, end, max_stations)
+    brand_ids = _brand_ids(api_brands, brands)
+    limit = Semaphore(4)
+
+    async def search(a: dict, b: dict) -> list[V3ConnectionResult]:
+        async with limit:
+            return await _page_connections(a["id"], b["id"], brand_ids, dt, direct, length)
+
+    batches = await gather(*(search(a, b) for a in starts for b in ends if a["id"] != b["id"]))
+    return starts, ends, merge_connections(list(batches), sort_by, length)
 
 
 async def search_connections(
@@ -16,42 +128,31 @@ async def search_connections(
     direct: bool = False,
     include_prices: bool = False,
     length: int = 5,
+    expand_groups: bool = False,
+    sort_by: str = "arrival",
+    max_stations: int = 4,
 ) -> dict:
+    if sort_by not in SORT_KEYS:
+        return {
+            "data": None,
+            "summary": f"sort_by must be one of: {', '.join(SORT_KEYS)}",
+            "error": "invalid_params",
+            "koleo_url": "",
+        }
     try:
         client = get_client()
         dt = datetime.fromisoformat(date) if date else datetime.now()
-
-        start_slug = start if ("-" in start and start.islower()) else name_to_slug(start)
-        end_slug = end if ("-" in end and end.islower()) else name_to_slug(end)
-
-        start_station, end_station, api_brands = await gather(
-            client.get_station_by_slug(start_slug),
-            client.get_station_by_slug(end_slug),
-            client.get_brands(),
-        )
-
-        if brands:
-            brands_lower = [b.lower() for b in brands]
-            brand_ids = [
-                b["id"]
-                for b in api_brands
-                if b["name"].lower() in brands_lower or b["logo_text"].lower() in brands_lower
-            ]
-        else:
-            brand_ids = [b["id"] for b in api_brands]
-
-        results = []
-        fetch_date = dt
-        while len(results) < length:
-            connections = await client.v3_connection_search(
-                start_station["id"], end_station["id"], brand_ids, fetch_date, direct
+        start_slug = _slug(start)
+        end_slug = _slug(end)
+        if expand_groups:
+            starts, ends, results = await find_group_connections(
+                start, end, dt, brands, direct, length, sort_by, max_stations
             )
-            if not connections:
-                break
-            results.extend(connections)
-            fetch_date = koleo_time_to_dt(connections[-1]["departure"]) + timedelta(seconds=1801)
-
-        results = results[:length]
+            start_name = f"{start} ({', '.join(s['name'] for s in starts)})"
+            end_name = f"{end} ({', '.join(s['name'] for s in ends)})"
+        else:
+            start_station, end_station, results = await find_connections(start, end, dt, brands, direct, length)
+            start_name, end_name = start_station["name"], end_station["name"]
 
         prices: dict = {}
         if include_prices and results:
@@ -65,7 +166,7 @@ async def search_connections(
         )
         return {
             "data": [{"connection": c, "price": prices.get(c["uuid"])} for c in results],
-            "summary": summarize_connections(results, start_station["name"], end_station["name"], prices),
+            "summary": summarize_connections(results, start_name, end_name, prices),
             "koleo_url": link,
         }
     except Exception as e:
@@ -0,0 +1,89 @@
+from asyncio import gather
+from datetime import datetime, timedelta
+
+from compact import Record
+from errors import handle_tool_error
+from formatters.board import summarize_corridor
+from tools import lookups
+from tools.board import _resolve_station
+
+
+def _run_id(train: Record) -> int | None:
+    # Board rows carry the per-run train id inside their stations list, not at the top level.
+    return next((s.get("train_id") for s in train.get("stations") or () if s.get("train_id") is not None), None)
+
+
+def _train_key(train: Record) -> tuple:
+    train_id = _run_id(train)
+    return ("id", train_id) if train_id is not None else ("name", train.get("train_full_name"))
+
+
+def join_boards(departures: list[Record], arrivals: list[Record], start: str, end: str) -> list[dict]:
+    """Hash-join a departures board with an arrivals board on train identity.
+
+    Keeps trains leaving between `start` and `end` (ISO minutes) that reach the other station after leaving.
+    When several arrivals share a key, the earliest one after the departure is used.
+    """
+    arriving: dict[tuple, list[Record]] = {}
+    for t in sorted((t for t in arrivals if t.get("arrival")), key=lambda t: t["arrival"]):
+        arriving.setdefault(_train_key(t), []).append(t)
+    matches = []
+    for dep in departures:
+        dep_time = dep.get("departure") or ""
+        if not start <= dep_time[:16] <= end:
+            continue
+        arr = next((a for a in arriving.get(_train_key(dep), ()) if a["arrival"][:16] > dep_time[:16]), None)
+        if arr is None:
+            continue
+        duration = datetime.fromisoformat(arr["arrival"]) - datetime.fromisoformat(dep_time)
+        matches.append(
+            {
+                "train_id": _run_id(dep),
+                "train": dep.get("train_full_name", ""),
+                "departure": dep_time,
+                "arrival": arr["arrival"],
+                "duration_min": int(duration.total_seconds() // 60),
+                "departure_platform": dep.get("platform", ""),
+                "arrival_platform": arr.get("platform", ""),
+            }
+        )
+    return sorted(matches, key=lambda m: m["departure"])
+
+
+async def get_direct_trains(start: str, end: str, date: str | None = None, hours: int = 2) -> dict:
+    """Find direct trains between two stations by joining the departures and arrivals boards."""
+    if hours <= 0:
+        return {
+            "data": None,
+            "summary": "hours must be greater than 0",
+            "error": "invalid_params",
+            "koleo_url": "",
+        }
+    try:
+        dt = datetime.fromisoformat(date) if date else datetime.now()
+        until = dt + timedelta(hours=hours)
+        start_st, end_st = await gather(_resolve_station(start), _resolve_station(end))
+
+        days = [dt + timedelta(days=i) for i in range((until.date() - dt.date()).days + 1)]
+        # Trains leaving late in the window may reach the destination after midnight.
+        arrival_days = days + [days[-1] + timedelta(days=1)]
+        boards = await gather(
+            *(lookups.departures(start_st["id"], day) for day in days),
+            *(lookups.arrivals(end_st["id"], day) for day in arrival_days),
+        )
+        departures = [t for board in boards[: len(days)] for t in board]
+        arrivals = [t for board in boards[len(days) :] for t in board]
+
+        trains = join_boards(departures, arrivals, dt.isoformat()[:16], until.isoformat()[:16])
+        return {
+            "data": trains,
+            "summary": summarize_corridor(
+                trains, start_st["name"], end_st["name"], dt.strftime("%Y-%m-%d %H:%M"), until.strftime("%H:%M")
+            ),
+            "koleo_url": (
+                f"https://koleo.pl/rozklad-pkp/{start_st['name_slug']}/{end_st['name_slug']}"
+                f"/{dt.strftime('%d-%m-%Y_%H:%M')}/direct/all"
+            ),
+        }
+    except Exception as e:
+        return handle_tool_error(e)
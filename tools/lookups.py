@@ -0,0 +1,72 @@
+from datetime import date, datetime
+
+from cache import cached
+from client import get_client
+from compact import Record, compact
+from prefetch import get_prefetcher
+
+_prefetcher = get_prefetcher()
+_prefetcher.register("station", lambda slug: get_client().get_station_by_slug(slug))
+
+
+async def _board(kind: str, key: tuple[int, str]) -> tuple[Record, ...]:
+    client = get_client()
+    fetch = client.get_departures if kind == "departures" else client.get_arrivals
+    return compact(await fetch(key[0], datetime.fromisoformat(key[1])))
+
+
+async def _train(train_id: int) -> Record:
+    client = get_client()
+    return compact(await cached("train", train_id, lambda: client.get_train(train_id)))
+
+
+def _past_day(key: tuple[int, str]) -> bool:
+    return key[1] < date.today().isoformat()
+
+
+async def _warm_route(key: tuple[str, str]) -> int:
+    warmed = 0
+    for kind, item in (("station", key[0]), ("station", key[1]), ("brands", None)):
+        warmed += await _prefetcher.prefetch(kind, item)
+    return warmed
+
+
+_prefetcher.register("departures", lambda key: _board("departures", key), stale=_past_day)
+_prefetcher.register("arrivals", lambda key: _board("arrivals", key), stale=_past_day)
+_prefetcher.register_warmer("route", _warm_route)
+_prefetcher.register("train", _train)
+_prefetcher.register("calendar", lambda key: get_client().get_train_calendars(key[0], key[1]))
+_prefetcher.register("brands", lambda _: get_client().get_brands())
+_prefetcher.register("carriers", lambda _: get_client().get_carriers())
+
+
+async def station_by_slug(slug: str) -> dict:
+    return await _prefetcher.fetch("station", slug)
+
+
+async def departures(station_id: int, dt: datetime) -> tuple[Record, ...]:
+    return await _prefetcher.fetch("departures", (station_id, dt.strftime("%Y-%m-%d")))
+
+
+async def arrivals(station_id: int, dt: datetime) -> tuple[Record, ...]:
+    return await _prefetcher.fetch("arrivals", (station_id, dt.strftime("%Y-%m-%d")))
+
+
+async def train(train_id: int) -> Record:
+    return await _prefetcher.fetch("train", train_id)
+
+
+async def train_calendars(brand: str, nr: int) -> dict:
+    return await _prefetcher.fetch("calendar", (brand, nr))
+
+
+async def brands() -> list:
+    return await _prefetcher.fetch("brands", None)
+
+
+async def carriers() -> list:
+    return await _prefetcher.fetch("carriers", None)
+
+
+def record_route(start_slug: str, end_slug: str) -> None:
+    _prefetcher.log.record("route", (start_slug, end_slug))
@@ -1,5 +1,6 @@
 from datetime import datetime
 
+from auth import ensure_authenticated
 from client import get_client
 from config import load_config
 from errors import handle_tool_error
@@ -21,6 +22,7 @@ async def get_realtime_timetable(train_id: int, operating_day: str | None = None
         }
     try:
         client = get_client()
+        await ensure_authenticated(client)
         day = datetime.fromisoformat(operating_day) if operating_day else datetime.now()
 
         timetable = await client.realtime_train_timetable(train_id, day)
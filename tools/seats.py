@@ -1,10 +1,13 @@
-from asyncio import gather
+from asyncio import Semaphore, gather
 from datetime import datetime
 
 from koleo.utils import name_to_slug
 
 from client import get_client
 from errors import handle_tool_error
+from formatters.seats import count_seats, summarize_occupancy
+from tools import lookups
+from tools.connections import find_connections
 
 
 async def get_seat_stats(
@@ -28,9 +31,9 @@ async def get_seat_stats(
         start_slug = name_to_slug(stations[0])
         end_slug = name_to_slug(stations[1])
         start_st, end_st, api_brands = await gather(
-            client.get_station_by_slug(start_slug),
-            client.get_station_by_slug(end_slug),
-            client.get_brands(),
+            lookups.station_by_slug(start_slug),
+            lookups.station_by_slug(end_slug),
+            lookups.brands(),
         )
 
         brand_upper = brand.upper()
@@ -59,17 +62,14 @@ async def get_seat_stats(
         train = detail["trains"][0]
         availability = await client.get_seats_availability(connection_id, train["train_nr"], 1)
 
-        seats = availability.get("seats", [])
-        total = len(seats)
-        free = sum(1 for s in seats if s["state"] == "FREE")
-        reserved = sum(1 for s in seats if s["state"] == "RESERVED")
-        blocked = total - free - reserved
+        counts = count_seats(availability.get("seats", []))
 
         return {
             "data": availability,
             "summary": (
                 f"{brand} {train_number} on {start_st['name']} -> {end_st['name']}:\n"
-                f"  {free}/{total} seats free, {reserved} reserved, {blocked} blocked"
+                f"  {counts['free']}/{counts['total']} seats free, "
+                f"{counts['reserved']} reserved, {counts['blocked']} blocked"
             ),
             "koleo_url": "",
         }
@@ -77,6 +77,90 @@ async def get_seat_stats(
         return handle_tool_error(e)
 
 
+async def get_connections_occupancy(
+    start: str,
+    end: str,
+    date: str | None = None,
+    brands: list[str] | None = None,
+    direct: bool = False,
+    length: int = 5,
+    place_types: list[int] | None = None,
+    concurrency: int = 4,
+) -> dict:
+    """Get a free/reserved/blocked table for every train leg of one connection search."""
+    try:
+        client = get_client()
+        dt = datetime.fromisoformat(date) if date else datetime.now()
+        place_types = place_types or [1]
+        limit = Semaphore(max(1, concurrency))
+
+        start_st, end_st, connections = await find_connections(start, end, dt, brands, direct, length)
+
+        def leg_departure(conn: dict, train: dict) -> str | None:
+            leg = next(
+                (
+                    leg
+                    for leg in conn.get("legs", [])
+                    if leg.get("leg_type") == "train_leg" and leg.get("train_nr") == train["train_nr"]
+                ),
+                None,
+            )
+            return (leg or {}).get("departure") or train.get("departure") or conn.get("departure")
+
+        async def occupancy(conn: dict, connection_id: int, train: dict, place_type: int) -> dict:
+            row = {
+                "departure": leg_departure(conn, train),
+                "train": train.get("train_full_name") or str(train["train_nr"]),
+                "train_nr": train["train_nr"],
+                "connection_id": connection_id,
+                "place_type": place_type,
+            }
+            try:
+                async with limit:
+                    availability = await client.get_seats_availability(connection_id, train["train_nr"], place_type)
+            except Exception as e:
+                return {**row, "error": type(e).__name__}
+            return {**row, **count_seats(availability.get("seats", []))}
+
+        async def connection_rows(conn: dict) -> list[dict]:
+            try:
+                async with limit:
+                    connection_id = await client.v3_get_connection_id(conn["uuid"])
+                    detail = await client.get_connection(connection_id)
+            except Exception as e:
+                legs = conn.get("legs", [])
+                names = [leg.get("train_full_name", "") for leg in legs if leg.get("leg_type") == "train_leg"]
+                return [
+                    {
+                        "departure": conn.get("departure"),
+                        "train": ", ".join(names) or "?",
+                        "train_nr": None,
+                        "connection_id": None,
+                        "place_type": None,
+                        "error": type(e).__name__,
+                    }
+                ]
+            return list(
+                await gather(
+                    *(
+                        occupancy(conn, connection_id, train, pt)
+                        for train in detail.get("trains", [])
+                        for pt in place_types
+                    )
+                )
+            )
+
+        rows = [row for conn_rows in await gather(*(connection_rows(c) for c in connections)) for row in conn_rows]
+
+        return {
+            "data": rows,
+            "summary": summarize_occupancy(rows, start_st["name"], end_st["name"]),
+            "koleo_url": "",
+        }
+    except Exception as e:
+        return handle_tool_error(e)
+
+
 async def get_seat_availability(connection_id: int, train_nr: int, place_type: int) -> dict:
     """Get raw seat availability for a specific connection/train/place_type combination."""
     try:
@@ -96,8 +180,7 @@ async def get_seat_availability(connection_id: int, train_nr: int, place_type: i
 
 async def get_brands() -> dict:
     try:
-        client = get_client()
-        brands = await client.get_brands()
+        brands = await lookups.brands()
         lines = [f"  {b['logo_text']:6} ({b['name']})" for b in brands]
         return {
             "data": brands,
@@ -110,8 +193,7 @@ async def get_brands() -> dict:
 
 async def get_carriers() -> dict:
     try:
-        client = get_client()
-        carriers = await client.get_carriers()
+        carriers = await lookups.carriers()
         lines = [f"  {c['short_name']:6} -- {c['name']}" for c in carriers]
         return {
             "data": carriers,
@@ -2,8 +2,10 @@ import asyncio
 
 from koleo.utils import name_to_slug
 
+from cache import cached
 from client import get_client
 from errors import handle_tool_error
+from tools import lookups
 
 
 async def search_stations(query: str, type: str | None = None, country: str | None = None) -> dict:
@@ -34,8 +36,8 @@ async def get_station_info(station: str) -> dict:
         client = get_client()
         slug = station if ("-" in station and station.islower()) else name_to_slug(station)
         st, info = await asyncio.gather(
-            client.get_station_by_slug(slug),
-            client.get_station_info_by_slug(slug),
+            lookups.station_by_slug(slug),
+            cached("station_info", slug, lambda: client.get_station_info_by_slug(slug)),
         )
         features = [f["name"] for f in info.get("features", []) if f.get("available")]
         address = info.get("address", {}).get("full", "N/A")
@@ -1,8 +1,9 @@
 from datetime import datetime
 
-from client import get_client
+from compact import to_json
 from errors import handle_tool_error
 from formatters.trains import summarize_train_route
+from tools import lookups
 
 
 async def get_train_route(
@@ -12,12 +13,11 @@ async def get_train_route(
     closest: bool = False,
 ) -> dict:
     try:
-        client = get_client()
         dt = datetime.fromisoformat(date) if date else datetime.now()
         brand_upper = brand.upper()
         nr = int(train_number) if train_number.isdigit() else 0
 
-        calendars = await client.get_train_calendars(brand_upper, nr)
+        calendars = await lookups.train_calendars(brand_upper, nr)
         cals = calendars.get("train_calendars", [])
         if not cals:
             return {"data": None, "summary": f"No train found for {brand} {train_number}", "koleo_url": ""}
@@ -37,9 +37,9 @@ async def get_train_route(
                 "koleo_url": "",
             }
 
-        detail = await client.get_train(train_id)
+        detail = await lookups.train(train_id)
         return {
-            "data": detail,
+            "data": to_json(detail),
             "summary": summarize_train_route(detail["train"], detail["stops"]),
             "koleo_url": f"https://koleo.pl/pl/trains/{train_id}",
         }
@@ -49,10 +49,9 @@ async def get_train_route(
 
 async def get_train_by_id(train_id: int) -> dict:
     try:
-        client = get_client()
-        detail = await client.get_train(train_id)
+        detail = await lookups.train(train_id)
         return {
-            "data": detail,
+            "data": to_json(detail),
             "summary": summarize_train_route(detail["train"], detail["stops"]),
             "koleo_url": f"https://koleo.pl/pl/trains/{train_id}",
         }
@@ -62,9 +61,8 @@ async def get_train_by_id(train_id: int) -> dict:
 
 async def get_train_calendar(brand: str, train_number: str) -> dict:
     try:
-        client = get_client()
         nr = int(train_number) if train_number.isdigit() else 0
-        calendars = await client.get_train_calendars(brand.upper(), nr)
+        calendars = await lookups.train_calendars(brand.upper(), nr)
         cals = calendars.get("train_calendars", [])
         if not cals:
             return {"data": [], "summary": f"No calendar found for {brand} {train_number}", "koleo_url": ""}